@@ -7,312 +7,374 @@ import math
 from pathlib import Path
 
 
-def stdnorm_pdf(x: float) -> float:
-    return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
-
-
-def stdnorm_cdf(x: float) -> float:
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-
-def fmt(value: float) -> str:
-    return f"{value:.2f}"
-
-
-def path_from_points(points: list[tuple[float, float]]) -> str:
-    if not points:
+SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+# Parameters (in standard deviation units).
+X_MIN, X_MAX = -3.0, 3.0
+DELTA = 0.4
+# Extra bin boundaries for the uniform panel (same spacing, but extending into the tails).
+X_UNIFORM_MIN, X_UNIFORM_MAX = -6.0, 6.0
+# Highlight one bin on the right tail.
+HIGHLIGHT_LEFT = 1.2
+HIGHLIGHT_RIGHT = 1.6
+
+# Layout.
+WIDTH, HEIGHT = 980.0, 680.0
+MARGIN_LEFT, MARGIN_RIGHT = 64.0, 40.0
+MARGIN_TOP, MARGIN_BOTTOM = 42.0, 80.0
+GAP = 78.0
+PLOT_W = (WIDTH - MARGIN_LEFT - MARGIN_RIGHT - GAP) / 2.0
+TOP_PLOT_H = 264.0
+MIDDLE_GAP = 120.0
+BAR_PLOT_H = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM - TOP_PLOT_H - MIDDLE_GAP
+if BAR_PLOT_H < 160:
+    raise ValueError("Figure layout error: bar_plot_h too small.")
+
+LEFT_X0 = MARGIN_LEFT
+RIGHT_X0 = MARGIN_LEFT + PLOT_W + GAP
+Y0 = MARGIN_TOP
+Y_BAR0 = Y0 + TOP_PLOT_H + MIDDLE_GAP
+
+BAR_X0 = MARGIN_LEFT
+BAR_W = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+BAR_GAP = 4.0
+
+# Scales.
+Y_MAX_GAUSS = 0.42
+Y_MAX_UNIF = 1.2
+Y_MAX_BAR = 0.18
+
+# Data -> SVG maps as affine coefficients: screen = a * value + b.
+GX_A = PLOT_W / (X_MAX - X_MIN)
+GX_B = LEFT_X0 - X_MIN * GX_A
+GY_A = -TOP_PLOT_H / Y_MAX_GAUSS
+GY_B = Y0 + TOP_PLOT_H
+UX_A = PLOT_W
+UX_B = RIGHT_X0
+UY_A = -TOP_PLOT_H / Y_MAX_UNIF
+UY_B = Y0 + TOP_PLOT_H
+BY_A = -BAR_PLOT_H / Y_MAX_BAR
+BY_B = Y_BAR0 + BAR_PLOT_H
+
+# Styling.
+INK = "#1f2a37"
+MUTED = "#5b6673"
+ACCENT = "#8b3a3a"
+ACCENT_SOFT = "#8b3a3a"
+
+AXIS_STROKE = INK
+AXIS_OPACITY = "0.35"
+GRID_OPACITY = "0.12"
+
+
+def stdnorm_pdfs(xs: list[float]) -> list[float]:
+    exp = math.exp
+    return [exp(-0.5 * x * x) / SQRT_2PI for x in xs]
+
+
+def pdf_curve(xs: list[float], x_a: float, x_b: float, y_a: float, y_b: float) -> tuple[list[float], list[float]]:
+    exp = math.exp
+    return [x_a * x + x_b for x in xs], [y_a * (exp(-0.5 * x * x) / SQRT_2PI) + y_b for x in xs]
+
+
+def linspace(start: float, stop: float, num: int) -> list[float]:
+    span = stop - start
+    last = num - 1.0
+    return [start + span * i / last for i in range(num)]
+
+
+def stdnorm_cdfs(xs: list[float]) -> list[float]:
+    # Phi(-a) = erfc(a / sqrt(2)) / 2 and Phi(a) = 1 - Phi(-a): one erfc call per distinct |x| serves both signs.
+    erfc = math.erfc
+    sqrt2 = math.sqrt(2.0)
+    lower_tails: dict[float, float] = {}
+    cdfs = []
+    for x in xs:
+        a = abs(x)
+        tail = lower_tails.get(a)
+        if tail is None:
+            tail = lower_tails[a] = 0.5 * erfc(a / sqrt2)
+        cdfs.append(tail if x < 0 else 1.0 - tail)
+    return cdfs
+
+
+# Bound method of a cached template: avoids a Python frame per formatted coordinate.
+fmt = "{:.2f}".format
+
+
+def path_from_arrays(xs: list[float], ys: list[float]) -> str:
+    if not xs:
         raise ValueError("Need at least one point to build a path.")
-    commands = [f"M {fmt(points[0][0])},{fmt(points[0][1])}"]
-    commands.extend(f"L {fmt(x)},{fmt(y)}" for x, y in points[1:])
-    return " ".join(commands)
+    if len(xs) != len(ys):
+        raise ValueError("Path coordinate sequences must have the same length.")
+    return "M " + " L ".join(map("{:.2f},{:.2f}".format, xs, ys))
 
 
 def clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
 
-def xml_escape(text: str) -> str:
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&apos;")
-    )
-
-
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Generate the partition-kernel pullback figure as an SVG.")
-    parser.add_argument(
-        "--out",
-        default=str(Path(__file__).with_name("partition_kernel_pullback.svg")),
-        help="Output SVG path (default: notes/assets/partition_kernel_pullback.svg).",
-    )
-    args = parser.parse_args()
-
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Parameters (in standard deviation units).
-    x_min, x_max = -3.0, 3.0
-    delta = 0.4
-
-    # Bin boundaries anchored at the mean (0): ..., -0.8, -0.4, 0, 0.4, 0.8, ...
-    k_min = math.ceil(x_min / delta)
-    k_max = math.floor(x_max / delta)
-    x_lines = [round(delta * k, 10) for k in range(k_min, k_max + 1)]
-
-    # Extra bin boundaries for the uniform panel (same spacing, but extending into the tails).
-    x_uniform_min, x_uniform_max = -6.0, 6.0
-    k_uniform_min = math.ceil(x_uniform_min / delta)
-    k_uniform_max = math.floor(x_uniform_max / delta)
-    x_lines_uniform = [round(delta * k, 10) for k in range(k_uniform_min, k_uniform_max + 1)]
-
-    # Highlight one bin on the right tail.
-    highlight_left = 1.2
-    highlight_right = 1.6
-    if highlight_left not in x_lines or highlight_right not in x_lines:
-        raise ValueError("Highlight endpoints must coincide with bin boundaries.")
-
-    u_lines = [stdnorm_cdf(x) for x in x_lines]
-    u_lines_uniform = [stdnorm_cdf(x) for x in x_lines_uniform]
-    highlight_u_left = stdnorm_cdf(highlight_left)
-    highlight_u_right = stdnorm_cdf(highlight_right)
-
-    # Layout.
-    width, height = 980.0, 680.0
-    margin_left, margin_right = 64.0, 40.0
-    margin_top, margin_bottom = 42.0, 80.0
-    gap = 78.0
-    plot_w = (width - margin_left - margin_right - gap) / 2.0
-    top_plot_h = 264.0
-    middle_gap = 120.0
-    bar_plot_h = height - margin_top - margin_bottom - top_plot_h - middle_gap
-    if bar_plot_h < 160:
-        raise ValueError("Figure layout error: bar_plot_h too small.")
-
-    left_x0 = margin_left
-    right_x0 = margin_left + plot_w + gap
-    y0 = margin_top
-    y_bar0 = y0 + top_plot_h + middle_gap
-
-    # Scales.
-    y_max_gauss = 0.42
-    y_max_unif = 1.2
-
-    def gx(x: float) -> float:
-        return left_x0 + (x - x_min) / (x_max - x_min) * plot_w
-
-    def gy(y: float) -> float:
-        return y0 + (y_max_gauss - y) / y_max_gauss * top_plot_h
-
-    def ux(u: float) -> float:
-        return right_x0 + u * plot_w
-
-    def uy(y: float) -> float:
-        return y0 + (y_max_unif - y) / y_max_unif * top_plot_h
-
-    def by(y: float) -> float:
-        y_max_bar = 0.18
-        return y_bar0 + (y_max_bar - y) / y_max_bar * bar_plot_h
 
-    # Curves.
-    gauss_points: list[tuple[float, float]] = []
-    for i in range(241):
-        x = x_min + (x_max - x_min) * i / 240.0
-        gauss_points.append((gx(x), gy(stdnorm_pdf(x))))
-
-    highlight_points: list[tuple[float, float]] = [(gx(highlight_left), gy(0.0))]
-    for i in range(81):
-        x = highlight_left + (highlight_right - highlight_left) * i / 80.0
-        highlight_points.append((gx(x), gy(stdnorm_pdf(x))))
-    highlight_points.append((gx(highlight_right), gy(0.0)))
-
-    # Styling.
-    ink = "#1f2a37"
-    muted = "#5b6673"
-    accent = "#8b3a3a"
-    accent_soft = "#8b3a3a"
-
-    axis_stroke = f"{ink}"
-    axis_opacity = "0.35"
-    grid_opacity = "0.12"
-
-    svg: list[str] = []
-    svg.append('<?xml version="1.0" encoding="UTF-8"?>')
-    svg.append(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {fmt(width)} {fmt(height)}" role="img">')
-    svg.append("  <title>Partition kernel on a Gaussian and its pullback to a uniform</title>")
-    svg.append("  <style>")
-    svg.append(f"    text {{ font-family: 'Crimson Pro', 'Times New Roman', serif; fill: {muted}; }}")
-    svg.append("    .label { font-size: 13px; }")
-    svg.append("    .small { font-size: 12px; }")
-    svg.append(f"    .axis {{ stroke: {axis_stroke}; stroke-opacity: {axis_opacity}; stroke-width: 1.2; }}")
-    svg.append(f"    .grid {{ stroke: {axis_stroke}; stroke-opacity: {grid_opacity}; stroke-width: 1; }}")
-    svg.append(f"    .curve {{ stroke: {ink}; stroke-width: 2.2; fill: none; }}")
-    svg.append(f"    .bin {{ stroke: {accent}; stroke-opacity: 0.35; stroke-width: 1.6; }}")
-    svg.append(f"    .bin-strong {{ stroke: {accent}; stroke-opacity: 0.75; stroke-width: 2.1; }}")
-    svg.append(f"    .fill {{ fill: {accent_soft}; fill-opacity: 0.32; stroke: none; }}")
-    svg.append(f"    .bar {{ fill: none; stroke: {accent}; stroke-opacity: 0.65; stroke-width: 1.2; }}")
-    svg.append(f"    .bar-highlight {{ fill: {accent_soft}; fill-opacity: 0.32; stroke: {accent}; stroke-opacity: 0.85; stroke-width: 1.4; }}")
-    svg.append("  </style>")
-
-    svg.append(f'  <rect x="0" y="0" width="{fmt(width)}" height="{fmt(height)}" fill="#ffffff" />')
+def _render_header() -> str:
+    # Everything drawn before the highlight fills depends only on the module constants.
+    svg = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {fmt(WIDTH)} {fmt(HEIGHT)}" role="img">\n',
+        f"""\
+  <title>Partition kernel on a Gaussian and its pullback to a uniform</title>
+  <style>
+    text {{ font-family: 'Crimson Pro', 'Times New Roman', serif; fill: {MUTED}; }}
+    .label {{ font-size: 13px; }}
+    .small {{ font-size: 12px; }}
+    .axis {{ stroke: {AXIS_STROKE}; stroke-opacity: {AXIS_OPACITY}; stroke-width: 1.2; }}
+    .grid {{ stroke: {AXIS_STROKE}; stroke-opacity: {GRID_OPACITY}; stroke-width: 1; }}
+    .curve {{ stroke: {INK}; stroke-width: 2.2; fill: none; }}
+    .bin {{ stroke: {ACCENT}; stroke-opacity: 0.35; stroke-width: 1.6; }}
+    .bin-strong {{ stroke: {ACCENT}; stroke-opacity: 0.75; stroke-width: 2.1; }}
+    .fill {{ fill: {ACCENT_SOFT}; fill-opacity: 0.32; stroke: none; }}
+    .bar {{ fill: none; stroke: {ACCENT}; stroke-opacity: 0.65; stroke-width: 1.2; }}
+    .bar-highlight {{ fill: {ACCENT_SOFT}; fill-opacity: 0.32; stroke: {ACCENT}; stroke-opacity: 0.85; stroke-width: 1.4; }}
+  </style>
+""",
+    ]
+    w = svg.append
+
+    w(f'  <rect x="0" y="0" width="{fmt(WIDTH)}" height="{fmt(HEIGHT)}" fill="#ffffff" />\n')
 
     # Titles.
-    svg.append(f'  <text class="label" x="{fmt(left_x0)}" y="{fmt(y0 - 18)}" fill="{ink}">Gaussian pdf (x-space)</text>')
-    svg.append(f'  <text class="label" x="{fmt(right_x0)}" y="{fmt(y0 - 18)}" fill="{ink}">Uniform pdf (u-space)</text>')
+    w(f'  <text class="label" x="{fmt(LEFT_X0)}" y="{fmt(Y0 - 18)}" fill="{INK}">Gaussian pdf (x-space)</text>\n')
+    w(f'  <text class="label" x="{fmt(RIGHT_X0)}" y="{fmt(Y0 - 18)}" fill="{INK}">Uniform pdf (u-space)</text>\n')
 
     # Arrow label.
-    arrow_y = y0 - 22
-    arrow_x1 = left_x0 + plot_w + 12
-    arrow_x2 = right_x0 - 12
-    svg.append(
+    arrow_y = Y0 - 22
+    arrow_x1 = LEFT_X0 + PLOT_W + 12
+    arrow_x2 = RIGHT_X0 - 12
+    w(
         f'  <defs><marker id="arrowhead" markerWidth="10" markerHeight="7" refX="8" refY="3.5" orient="auto">'
-        f'<polygon points="0 0, 10 3.5, 0 7" fill="{muted}" /></marker></defs>'
+        f'<polygon points="0 0, 10 3.5, 0 7" fill="{MUTED}" /></marker></defs>\n'
     )
-    svg.append(
+    w(
         f'  <line x1="{fmt(arrow_x1)}" y1="{fmt(arrow_y)}" x2="{fmt(arrow_x2)}" y2="{fmt(arrow_y)}" '
-        f'stroke="{muted}" stroke-width="1.4" marker-end="url(#arrowhead)" opacity="0.7" />'
+        f'stroke="{MUTED}" stroke-width="1.4" marker-end="url(#arrowhead)" opacity="0.7" />\n'
     )
-    svg.append(
-        f'  <text class="small" x="{fmt((arrow_x1 + arrow_x2) / 2.0 - 28)}" y="{fmt(arrow_y - 6)}" fill="{muted}">u = Φ(x)</text>'
+    w(
+        f'  <text class="small" x="{fmt((arrow_x1 + arrow_x2) / 2.0 - 28)}" y="{fmt(arrow_y - 6)}" fill="{MUTED}">u = Φ(x)</text>\n'
     )
 
     # Axes rectangles.
-    for x0_plot in (left_x0, right_x0):
-        svg.append(
-            f'  <rect x="{fmt(x0_plot)}" y="{fmt(y0)}" width="{fmt(plot_w)}" height="{fmt(top_plot_h)}" fill="none" stroke="#000000" stroke-opacity="0.05" />'
+    for x0_plot in (LEFT_X0, RIGHT_X0):
+        w(
+            f'  <rect x="{fmt(x0_plot)}" y="{fmt(Y0)}" width="{fmt(PLOT_W)}" height="{fmt(TOP_PLOT_H)}" fill="none" stroke="#000000" stroke-opacity="0.05" />\n'
         )
 
     # Gaussian axes.
-    svg.append(f'  <line class="axis" x1="{fmt(left_x0)}" y1="{fmt(y0 + top_plot_h)}" x2="{fmt(left_x0 + plot_w)}" y2="{fmt(y0 + top_plot_h)}" />')
-    svg.append(f'  <line class="axis" x1="{fmt(left_x0)}" y1="{fmt(y0)}" x2="{fmt(left_x0)}" y2="{fmt(y0 + top_plot_h)}" />')
+    w(f'  <line class="axis" x1="{fmt(LEFT_X0)}" y1="{fmt(Y0 + TOP_PLOT_H)}" x2="{fmt(LEFT_X0 + PLOT_W)}" y2="{fmt(Y0 + TOP_PLOT_H)}" />\n')
+    w(f'  <line class="axis" x1="{fmt(LEFT_X0)}" y1="{fmt(Y0)}" x2="{fmt(LEFT_X0)}" y2="{fmt(Y0 + TOP_PLOT_H)}" />\n')
 
     # Uniform axes.
-    svg.append(f'  <line class="axis" x1="{fmt(right_x0)}" y1="{fmt(y0 + top_plot_h)}" x2="{fmt(right_x0 + plot_w)}" y2="{fmt(y0 + top_plot_h)}" />')
-    svg.append(f'  <line class="axis" x1="{fmt(right_x0)}" y1="{fmt(y0)}" x2="{fmt(right_x0)}" y2="{fmt(y0 + top_plot_h)}" />')
+    w(f'  <line class="axis" x1="{fmt(RIGHT_X0)}" y1="{fmt(Y0 + TOP_PLOT_H)}" x2="{fmt(RIGHT_X0 + PLOT_W)}" y2="{fmt(Y0 + TOP_PLOT_H)}" />\n')
+    w(f'  <line class="axis" x1="{fmt(RIGHT_X0)}" y1="{fmt(Y0)}" x2="{fmt(RIGHT_X0)}" y2="{fmt(Y0 + TOP_PLOT_H)}" />\n')
 
     # Simple y-grid lines.
     for y_tick in (0.2, 0.4):
-        y_svg = gy(y_tick)
-        svg.append(f'  <line class="grid" x1="{fmt(left_x0)}" y1="{fmt(y_svg)}" x2="{fmt(left_x0 + plot_w)}" y2="{fmt(y_svg)}" />')
-        svg.append(f'  <text class="small" x="{fmt(left_x0 - 28)}" y="{fmt(y_svg + 4)}">{y_tick:.1f}</text>')
-    svg.append(f'  <text class="small" x="{fmt(left_x0 - 18)}" y="{fmt(gy(0.0) + 4)}">0</text>')
+        y_svg = GY_A * y_tick + GY_B
+        w(f'  <line class="grid" x1="{fmt(LEFT_X0)}" y1="{fmt(y_svg)}" x2="{fmt(LEFT_X0 + PLOT_W)}" y2="{fmt(y_svg)}" />\n')
+        w(f'  <text class="small" x="{fmt(LEFT_X0 - 28)}" y="{fmt(y_svg + 4)}">{y_tick:.1f}</text>\n')
+    w(f'  <text class="small" x="{fmt(LEFT_X0 - 18)}" y="{fmt(GY_B + 4)}">0</text>\n')
 
     for y_tick in (1.0,):
-        y_svg = uy(y_tick)
-        svg.append(f'  <line class="grid" x1="{fmt(right_x0)}" y1="{fmt(y_svg)}" x2="{fmt(right_x0 + plot_w)}" y2="{fmt(y_svg)}" />')
-        svg.append(f'  <text class="small" x="{fmt(right_x0 - 18)}" y="{fmt(y_svg + 4)}">{y_tick:.0f}</text>')
-    svg.append(f'  <text class="small" x="{fmt(right_x0 - 18)}" y="{fmt(uy(0.0) + 4)}">0</text>')
+        y_svg = UY_A * y_tick + UY_B
+        w(f'  <line class="grid" x1="{fmt(RIGHT_X0)}" y1="{fmt(y_svg)}" x2="{fmt(RIGHT_X0 + PLOT_W)}" y2="{fmt(y_svg)}" />\n')
+        w(f'  <text class="small" x="{fmt(RIGHT_X0 - 18)}" y="{fmt(y_svg + 4)}">{y_tick:.0f}</text>\n')
+    w(f'  <text class="small" x="{fmt(RIGHT_X0 - 18)}" y="{fmt(UY_B + 4)}">0</text>\n')
 
     # X ticks.
     for tick in (-3, -2, -1, 0, 1, 2, 3):
-        x_svg = gx(float(tick))
-        svg.append(f'  <line class="axis" x1="{fmt(x_svg)}" y1="{fmt(y0 + top_plot_h)}" x2="{fmt(x_svg)}" y2="{fmt(y0 + top_plot_h + 6)}" />')
-        svg.append(f'  <text class="small" x="{fmt(x_svg - 6)}" y="{fmt(y0 + top_plot_h + 24)}">{tick}</text>')
-    svg.append(f'  <text class="small" x="{fmt(left_x0 + plot_w / 2.0 - 54)}" y="{fmt(y0 + top_plot_h + 44)}">x (σ units)</text>')
+        x_svg = GX_A * tick + GX_B
+        w(f'  <line class="axis" x1="{fmt(x_svg)}" y1="{fmt(Y0 + TOP_PLOT_H)}" x2="{fmt(x_svg)}" y2="{fmt(Y0 + TOP_PLOT_H + 6)}" />\n')
+        w(f'  <text class="small" x="{fmt(x_svg - 6)}" y="{fmt(Y0 + TOP_PLOT_H + 24)}">{tick}</text>\n')
+    w(f'  <text class="small" x="{fmt(LEFT_X0 + PLOT_W / 2.0 - 54)}" y="{fmt(Y0 + TOP_PLOT_H + 44)}">x (σ units)</text>\n')
 
     for tick, label in ((0.0, "0"), (0.5, "0.5"), (1.0, "1")):
-        x_svg = ux(tick)
-        svg.append(f'  <line class="axis" x1="{fmt(x_svg)}" y1="{fmt(y0 + top_plot_h)}" x2="{fmt(x_svg)}" y2="{fmt(y0 + top_plot_h + 6)}" />')
-        svg.append(f'  <text class="small" x="{fmt(x_svg - 7)}" y="{fmt(y0 + top_plot_h + 24)}">{label}</text>')
-    svg.append(f'  <text class="small" x="{fmt(right_x0 + plot_w / 2.0 - 8)}" y="{fmt(y0 + top_plot_h + 44)}">u</text>')
-
-    # Highlight fills.
-    svg.append(f'  <path class="fill" d="{path_from_points(highlight_points)} Z" />')
-    svg.append(
-        f'  <rect class="fill" x="{fmt(ux(highlight_u_left))}" y="{fmt(uy(1.0))}" width="{fmt(ux(highlight_u_right) - ux(highlight_u_left))}" height="{fmt(uy(0.0) - uy(1.0))}" />'
-    )
+        x_svg = UX_A * tick + UX_B
+        w(f'  <line class="axis" x1="{fmt(x_svg)}" y1="{fmt(Y0 + TOP_PLOT_H)}" x2="{fmt(x_svg)}" y2="{fmt(Y0 + TOP_PLOT_H + 6)}" />\n')
+        w(f'  <text class="small" x="{fmt(x_svg - 7)}" y="{fmt(Y0 + TOP_PLOT_H + 24)}">{label}</text>\n')
+    w(f'  <text class="small" x="{fmt(RIGHT_X0 + PLOT_W / 2.0 - 8)}" y="{fmt(Y0 + TOP_PLOT_H + 44)}">u</text>\n')
 
-    # Partition/bin boundary lines.
-    for x in x_lines:
-        klass = "bin-strong" if x in (highlight_left, highlight_right) else "bin"
-        svg.append(
-            f'  <line class="{klass}" x1="{fmt(gx(x))}" y1="{fmt(gy(0.0))}" x2="{fmt(gx(x))}" y2="{fmt(gy(stdnorm_pdf(x)))}" />'
-        )
+    return "".join(svg)
 
-    for u in u_lines_uniform:
-        klass = "bin-strong" if abs(u - highlight_u_left) < 1e-12 or abs(u - highlight_u_right) < 1e-12 else "bin"
-        svg.append(
-            f'  <line class="{klass}" x1="{fmt(ux(u))}" y1="{fmt(uy(0.0))}" x2="{fmt(ux(u))}" y2="{fmt(uy(1.0))}" />'
-        )
 
-    # Gaussian curve.
-    svg.append(f'  <path class="curve" d="{path_from_points(gauss_points)}" />')
+def _render_bar_frame() -> str:
+    # Drawn between the Gaussian curve and the bars: the uniform density line and the bottom panel's frame.
+    svg: list[str] = []
+    w = svg.append
 
     # Uniform density line.
-    svg.append(f'  <line class="curve" x1="{fmt(ux(0.0))}" y1="{fmt(uy(1.0))}" x2="{fmt(ux(1.0))}" y2="{fmt(uy(1.0))}" />')
+    w(f'  <line class="curve" x1="{fmt(UX_B)}" y1="{fmt(UY_A + UY_B)}" x2="{fmt(UX_A + UX_B)}" y2="{fmt(UY_A + UY_B)}" />\n')
 
     # --- Bottom panel: distribution of the coarse variable Y ---
-    svg.append(f'  <text class="label" x="{fmt(margin_left)}" y="{fmt(y_bar0 - 18)}" fill="{ink}">Distribution of the coarse variable Y</text>')
+    w(f'  <text class="label" x="{fmt(MARGIN_LEFT)}" y="{fmt(Y_BAR0 - 18)}" fill="{INK}">Distribution of the coarse variable Y</text>\n')
 
-    bar_x0 = margin_left
-    bar_w = width - margin_left - margin_right
-
-    svg.append(
-        f'  <rect x="{fmt(bar_x0)}" y="{fmt(y_bar0)}" width="{fmt(bar_w)}" height="{fmt(bar_plot_h)}" fill="none" stroke="#000000" stroke-opacity="0.05" />'
+    w(
+        f'  <rect x="{fmt(BAR_X0)}" y="{fmt(Y_BAR0)}" width="{fmt(BAR_W)}" height="{fmt(BAR_PLOT_H)}" fill="none" stroke="#000000" stroke-opacity="0.05" />\n'
     )
-    svg.append(
-        f'  <line class="axis" x1="{fmt(bar_x0)}" y1="{fmt(y_bar0 + bar_plot_h)}" x2="{fmt(bar_x0 + bar_w)}" y2="{fmt(y_bar0 + bar_plot_h)}" />'
+    w(
+        f'  <line class="axis" x1="{fmt(BAR_X0)}" y1="{fmt(Y_BAR0 + BAR_PLOT_H)}" x2="{fmt(BAR_X0 + BAR_W)}" y2="{fmt(Y_BAR0 + BAR_PLOT_H)}" />\n'
     )
-    svg.append(
-        f'  <line class="axis" x1="{fmt(bar_x0)}" y1="{fmt(y_bar0)}" x2="{fmt(bar_x0)}" y2="{fmt(y_bar0 + bar_plot_h)}" />'
+    w(
+        f'  <line class="axis" x1="{fmt(BAR_X0)}" y1="{fmt(Y_BAR0)}" x2="{fmt(BAR_X0)}" y2="{fmt(Y_BAR0 + BAR_PLOT_H)}" />\n'
     )
 
-    # Discrete bins: include two tail bins so the mass sums to 1.
-    inner_edges = x_lines
-    bins: list[tuple[float | None, float | None]] = [(None, inner_edges[0])]
-    bins.extend((inner_edges[i], inner_edges[i + 1]) for i in range(len(inner_edges) - 1))
-    bins.append((inner_edges[-1], None))
-
-    probs: list[float] = []
-    for left, right in bins:
-        if left is None and right is not None:
-            probs.append(stdnorm_cdf(right))
-        elif left is not None and right is None:
-            probs.append(1.0 - stdnorm_cdf(left))
-        elif left is not None and right is not None:
-            probs.append(stdnorm_cdf(right) - stdnorm_cdf(left))
-        else:
-            raise ValueError("Invalid bin interval.")
-
-    y_max_bar = 0.18
     for y_tick in (0.05, 0.10, 0.15):
-        y_svg = by(y_tick)
-        svg.append(f'  <line class="grid" x1="{fmt(bar_x0)}" y1="{fmt(y_svg)}" x2="{fmt(bar_x0 + bar_w)}" y2="{fmt(y_svg)}" />')
-        svg.append(f'  <text class="small" x="{fmt(bar_x0 - 38)}" y="{fmt(y_svg + 4)}">{y_tick:.2f}</text>')
-    svg.append(f'  <text class="small" x="{fmt(bar_x0 - 18)}" y="{fmt(by(0.0) + 4)}">0</text>')
-    svg.append(f'  <text class="small" x="{fmt(bar_x0 - 48)}" y="{fmt(y_bar0 + 14)}">P(Y)</text>')
-
-    n_bars = len(bins)
-    bar_gap = 4.0
-    per_bar = (bar_w - bar_gap * (n_bars - 1)) / n_bars
-
-    def bin_label(left: float | None, right: float | None) -> str:
-        if left is None:
-            return "…"
-        if right is None:
-            return "…"
-        return f"X ∈ [{left:.1f},{right:.1f})"
-
-    for idx, ((left, right), p) in enumerate(zip(bins, probs)):
-        x_left = bar_x0 + idx * (per_bar + bar_gap)
-        y_top = by(clamp(p, 0.0, y_max_bar))
-        height_px = y_bar0 + bar_plot_h - y_top
-
-        is_highlight = left == highlight_left and right == highlight_right
-        klass = "bar-highlight" if is_highlight else "bar"
-        svg.append(f'  <rect class="{klass}" x="{fmt(x_left)}" y="{fmt(y_top)}" width="{fmt(per_bar)}" height="{fmt(height_px)}" />')
-
-        label = xml_escape(bin_label(left, right))
-        label_x = x_left + per_bar / 2.0
-        label_y = y_bar0 + bar_plot_h + 20.0
-        svg.append(
-            f'  <text class="small" x="{fmt(label_x)}" y="{fmt(label_y)}" text-anchor="end" transform="rotate(-55 {fmt(label_x)},{fmt(label_y)})">{label}</text>'
+        y_svg = BY_A * y_tick + BY_B
+        w(f'  <line class="grid" x1="{fmt(BAR_X0)}" y1="{fmt(y_svg)}" x2="{fmt(BAR_X0 + BAR_W)}" y2="{fmt(y_svg)}" />\n')
+        w(f'  <text class="small" x="{fmt(BAR_X0 - 38)}" y="{fmt(y_svg + 4)}">{y_tick:.2f}</text>\n')
+    w(f'  <text class="small" x="{fmt(BAR_X0 - 18)}" y="{fmt(BY_B + 4)}">0</text>\n')
+    w(f'  <text class="small" x="{fmt(BAR_X0 - 48)}" y="{fmt(Y_BAR0 + 14)}">P(Y)</text>\n')
+
+    return "".join(svg)
+
+
+# Static parts of the figure, rendered once at import; main() only fills in the data-dependent pieces.
+HEADER = _render_header()
+BAR_FRAME = _render_bar_frame()
+FOOTER = "</svg>\n"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate the partition-kernel pullback figure as an SVG.")
+    parser.add_argument(
+        "--out",
+        default=str(Path(__file__).with_name("partition_kernel_pullback.svg")),
+        help="Output SVG path (default: notes/assets/partition_kernel_pullback.svg).",
+    )
+    args = parser.parse_args()
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Bin boundaries anchored at the mean (0): ..., -0.8, -0.4, 0, 0.4, 0.8, ...
+    k_min = math.ceil(X_MIN / DELTA)
+    k_max = math.floor(X_MAX / DELTA)
+    ks = range(k_min, k_max + 1)
+    x_lines = [DELTA * k for k in ks]
+
+    k_uniform_min = math.ceil(X_UNIFORM_MIN / DELTA)
+    k_uniform_max = math.floor(X_UNIFORM_MAX / DELTA)
+    ks_uniform = range(k_uniform_min, k_uniform_max + 1)
+    x_lines_uniform = [DELTA * k for k in ks_uniform]
+
+    # The highlighted bin's edges are tracked by integer grid index.
+    k_hl_left = round(HIGHLIGHT_LEFT / DELTA)
+    k_hl_right = round(HIGHLIGHT_RIGHT / DELTA)
+    if not (
+        k_hl_left in ks
+        and k_hl_right in ks
+        and math.isclose(DELTA * k_hl_left, HIGHLIGHT_LEFT)
+        and math.isclose(DELTA * k_hl_right, HIGHLIGHT_RIGHT)
+    ):
+        raise ValueError("Highlight endpoints must coincide with bin boundaries.")
+
+    u_lines_uniform = stdnorm_cdfs(x_lines_uniform)
+    # x_lines is the central slice of the same delta grid, so its CDFs are the matching slice.
+    u_lines = u_lines_uniform[k_min - k_uniform_min : k_max - k_uniform_min + 1]
+    highlight_u_left = u_lines[k_hl_left - k_min]
+    highlight_u_right = u_lines[k_hl_right - k_min]
+
+    # Discrete bins: include two tail bins (open-ended via -inf/+inf edges) so the mass sums to 1.
+    edges = [-math.inf, *x_lines, math.inf]
+    bin_lefts = edges[:-1]
+    bin_rights = edges[1:]
+
+    # Bin masses as differences of the edge CDFs (u_lines = Phi(x_lines); Phi(-inf) = 0, Phi(inf) = 1).
+    cdf_edges = [0.0, *u_lines, 1.0]
+    probs = [right - left for left, right in zip(cdf_edges, cdf_edges[1:])]
+
+    n_bars = len(probs)
+    per_bar = (BAR_W - BAR_GAP * (n_bars - 1)) / n_bars
+
+    # Curves.
+    gauss_xs = linspace(X_MIN, X_MAX, 241)
+    gauss_sx, gauss_sy = pdf_curve(gauss_xs, GX_A, GX_B, GY_A, GY_B)
+
+    highlight_xs = linspace(HIGHLIGHT_LEFT, HIGHLIGHT_RIGHT, 81)
+    highlight_sx, highlight_sy = pdf_curve(highlight_xs, GX_A, GX_B, GY_A, GY_B)
+    highlight_sx = [GX_A * HIGHLIGHT_LEFT + GX_B, *highlight_sx, GX_A * HIGHLIGHT_RIGHT + GX_B]
+    highlight_sy = [GY_B, *highlight_sy, GY_B]
+
+    # Bin geometry: screen-space columns for both boundary panels and the bars, computed up front.
+    gy0 = fmt(GY_B)
+    gx_lines = [fmt(GX_A * x + GX_B) for x in x_lines]
+    gy_lines = [fmt(GY_A * y + GY_B) for y in stdnorm_pdfs(x_lines)]
+    line_classes = ["bin-strong" if k == k_hl_left or k == k_hl_right else "bin" for k in ks]
+
+    uy0 = fmt(UY_B)
+    uy1 = fmt(UY_A + UY_B)
+    # Cull far-tail boundaries that stack onto the panel edges (u within 1e-4 of 0 or 1).
+    visible_uniform = [
+        (k, u)
+        for k, u in zip(ks_uniform, u_lines_uniform)
+        if 1e-4 < u < 1.0 - 1e-4 or k == k_hl_left or k == k_hl_right
+    ]
+    ux_lines_uniform = [fmt(UX_A * u + UX_B) for _, u in visible_uniform]
+    line_classes_uniform = [
+        "bin-strong" if k == k_hl_left or k == k_hl_right else "bin" for k, _ in visible_uniform
+    ]
+
+    bar_lefts = [BAR_X0 + idx * (per_bar + BAR_GAP) for idx in range(n_bars)]
+    bar_tops = [BY_A * clamp(p, 0.0, Y_MAX_BAR) + BY_B for p in probs]
+    bar_xs = [fmt(x) for x in bar_lefts]
+    bar_ys = [fmt(y) for y in bar_tops]
+    bar_heights = [fmt(Y_BAR0 + BAR_PLOT_H - y) for y in bar_tops]
+    bar_label_xs = [fmt(x + per_bar / 2.0) for x in bar_lefts]
+    bar_labels = [
+        "…" if math.isinf(left) or math.isinf(right) else f"X ∈ [{left:.1f},{right:.1f})"
+        for left, right in zip(bin_lefts, bin_rights)
+    ]
+    # Labels are built from formatted floats only, so they never need XML escaping.
+    assert not any(c in label for label in bar_labels for c in "&<>\"'")
+    # Bar idx spans grid edges (k_min + idx - 1, k_min + idx); the first and last bars are the open tails.
+    bar_classes = [
+        "bar-highlight" if k_min + idx - 1 == k_hl_left and k_min + idx == k_hl_right else "bar"
+        for idx in range(n_bars)
+    ]
+
+    with out_path.open("w", encoding="utf-8", buffering=1 << 16) as f:
+        w = f.write
+        w(HEADER)
+
+        # Highlight fills.
+        w(f'  <path class="fill" d="{path_from_arrays(highlight_sx, highlight_sy)} Z" />\n')
+        w(
+            f'  <rect class="fill" x="{fmt(UX_A * highlight_u_left + UX_B)}" y="{fmt(UY_A + UY_B)}" width="{fmt(UX_A * (highlight_u_right - highlight_u_left))}" height="{fmt(-UY_A)}" />\n'
         )
 
-    svg.append("</svg>")
+        # Partition/bin boundary lines.
+        w("".join(
+            f'  <line class="{klass}" x1="{x_svg}" y1="{gy0}" x2="{x_svg}" y2="{y_svg}" />\n'
+            for klass, x_svg, y_svg in zip(line_classes, gx_lines, gy_lines)
+        ))
+        w("".join(
+            f'  <line class="{klass}" x1="{x_svg}" y1="{uy0}" x2="{x_svg}" y2="{uy1}" />\n'
+            for klass, x_svg in zip(line_classes_uniform, ux_lines_uniform)
+        ))
+
+        # Gaussian curve.
+        w(f'  <path class="curve" d="{path_from_arrays(gauss_sx, gauss_sy)}" />\n')
+
+        w(BAR_FRAME)
+
+        label_y = fmt(Y_BAR0 + BAR_PLOT_H + 20.0)
+        bar_width = fmt(per_bar)
+        w("".join(
+            f'  <rect class="{klass}" x="{x_svg}" y="{y_svg}" width="{bar_width}" height="{h_svg}" />\n'
+            f'  <text class="small" x="{label_x}" y="{label_y}" text-anchor="end" transform="rotate(-55 {label_x},{label_y})">{label}</text>\n'
+            for klass, x_svg, y_svg, h_svg, label_x, label in zip(
+                bar_classes, bar_xs, bar_ys, bar_heights, bar_label_xs, bar_labels
+            )
+        ))
+
+        w(FOOTER)
 
-    out_path.write_text("\n".join(svg) + "\n", encoding="utf-8")
     return 0
 
 